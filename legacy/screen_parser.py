@@ -1,12 +1,13 @@
-import cv2
-import pytesseract
-import numpy as np
-import mss
 import json
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, TYPE_CHECKING
 from itertools import chain
 
+# cv2 / pytesseract / mss / numpy are heavy optional OCR backends; they are
+# imported on first use so that importing this module stays cheap.
+if TYPE_CHECKING:
+    import numpy as np
+
 class ScreenScraper:
     def __init__(self, config_path: str="./src/acquisition/config.json"):
         config_path = Path(config_path)
@@ -15,7 +16,14 @@ class ScreenScraper:
             cfg = json.load(f)
         self.roi = cfg["main_roi"] 
         self.sub_rois = cfg.get("sub_rois", {})
-        self.sct = mss.mss()
+        self._sct = None
+
+    @property
+    def sct(self):
+        if self._sct is None:
+            import mss
+            self._sct = mss.mss()
+        return self._sct
 
     def normalize_rois(self, val):
         if isinstance(val, dict):
@@ -27,6 +35,9 @@ class ScreenScraper:
         return []
 
     def grab_frame(self):
+        import cv2
+        import numpy as np
+
         monitor = {
             "top": self.roi["y"],
             "left": self.roi["x"],
@@ -38,7 +49,9 @@ class ScreenScraper:
         img = np.array(sct_img)
         return cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
 
-    def preprocess(self, img: np.ndarray):
+    def preprocess(self, img: "np.ndarray"):
+        import cv2
+
         crops = {}
         for key, val in self.sub_rois.items():
             rois = self.normalize_rois(val)
@@ -52,7 +65,9 @@ class ScreenScraper:
                 crops[key].append(thresh)
         return crops 
 
-    def do_ocr(self, img:np.ndarray, config: str = ""):
+    def do_ocr(self, img: "np.ndarray", config: str = ""):
+        import pytesseract
+
         return pytesseract.image_to_string(img, config=config).strip()
 
     def parse_text(self, raw: str, region: str):
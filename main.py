@@ -1,4 +1,10 @@
-from src.app import main
+import os
+import sys
+
+# the app's modules import each other from src/ (ingest, stats, ...)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from app import main
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
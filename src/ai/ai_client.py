@@ -1,5 +1,4 @@
 import abc
-import openai
 from typing import Any, Dict, List
 
 
@@ -26,7 +25,11 @@ class AIClient(abc.ABC):
 
 class OpenAIAPIClient(AIClient):
     def __init__(self, api_key: str, model: str = "gpt-4-turbo"):
+        # openai is an optional backend; only pay for the import once a client is built
+        import openai
+
         openai.api_key = api_key
+        self._openai = openai
         self.model = model
 
     def generate(
@@ -37,7 +40,7 @@ class OpenAIAPIClient(AIClient):
         temperature: float = 0.7,
         **kwargs
     ) -> str:
-        response = openai.ChatCompletion.create(
+        response = self._openai.ChatCompletion.create(
             model=self.model,
             messages=messages,
             max_tokens=max_tokens,
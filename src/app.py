@@ -1,18 +1,57 @@
+import atexit
+import time
+from typing import Optional
 from loguru import logger
 from ingest.watch import FileWatcher
 from ingest.parser import parse_hand
-from stats.calculator import StatsCalculator
+from stats.calculator import StatsManager
+from stats.registry import HUD
+from settings import SNAPSHOT_PATH, SNAPSHOT_EVERY
+
+# built by restore_snapshot() from main(), not on import
+stats: Optional[StatsManager] = None
+
+def restore_snapshot():
+    """Create the StatsManager, warm-started from the last snapshot if there is one."""
+    global stats
+    stats = StatsManager(HUD)
+    if not SNAPSHOT_PATH.is_file():
+        return
+    t0 = time.perf_counter()
+    try:
+        stats = StatsManager.load_snapshot(str(SNAPSHOT_PATH), HUD)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable stats snapshot: {e}")
+        return
+    logger.info(f"Restored stats for {len(stats.by_player)} players in {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+def save_snapshot():
+    """Final snapshot on exit: let the writer thread finish, then write synchronously."""
+    if stats is None:
+        return
+    try:
+        stats.close()
+        stats.save_snapshot(str(SNAPSHOT_PATH))
+    except Exception as e:
+        logger.exception(f"Failed to write stats snapshot: {e}")
 
 def on_new_hand_text(hand_text: str):
     try:
         hand = parse_hand(hand_text)
-        logger.debug(f"Parsed hand {hand.hand_id} at {hand.table_name}")
-        # TODO: feed a StatsCalculator instance and later trigger HUD refresh
+        logger.debug(f"Parsed hand {hand.hand_id} at {hand.table}")
+        stats.update_with_hand(hand)
+        if stats.hands_seen % SNAPSHOT_EVERY == 0:
+            # the file itself is written off the ingest thread
+            stats.save_snapshot_async(str(SNAPSHOT_PATH))
+        # TODO: trigger HUD refresh
     except Exception as e:
         logger.exception(f"Failed to parse hand: {e}")
 
 def main():
     logger.info("HeadsUp starting…")
+    restore_snapshot()
+    # hands since the last periodic write would otherwise be lost on exit
+    atexit.register(save_snapshot)
     # TODO: read path from settings; for now, placeholder
     # watcher = FileWatcher(r'C:\Path\to\PokerStars\HandHistory\latest.txt', on_new_hand_text)
     # watcher.start()
@@ -31,6 +31,7 @@ class Hand:
     showdown: Dict[str, List[str]] = field(default_factory=dict)
     winners: List[str] = field(default_factory=list)
     win_amounts: Dict[str, float] = field(default_factory=dict)
+    uncalled: Dict[str, float] = field(default_factory=dict)
 
 
 
@@ -40,16 +41,19 @@ def parse_hand(hand_text: str) -> Hand:
     header = lines[0]
 
     # Regex patterns
-    header_re = re.compile(r"PokerStars Hand #(?P<id>\d+):(?: Tournament #(?P<tour>\d+), )? (?P<stakes>[^-]+)- (?P<date>.+)")
+    header_re = re.compile(r"PokerStars Hand #(?P<id>\d+):(?: Tournament #(?P<tour>\d+), )? (?P<stakes>.+?) - (?P<date>\d{4}/.+)")
+    # tournament stakes run on to the blind level, e.g. "... No Limit - Level V (25/50)"
     table_re = re.compile(r"Table '(?P<table>[^']+)' \d+-max Seat #(?P<button>\d+) is the button")
     seat_re = re.compile(r"Seat (?P<seat>\d+): (?P<name>\S+) \(?\$?(?P<stack>[\d\.]+) in chips\)?")
-    post_re = re.compile(r"(?P<player>\S+): posts (?:small blind|big blind|the ante|small blind|big blind) ?(?P<amount>[\d\.]+)")
-    # Note: ante, sb, bb all captured
+    post_re = re.compile(r"(?P<player>\S+): posts (?P<kind>small blind|big blind|the ante) ?\$?(?P<amount>[\d\.]+)")
+    # Note: ante, sb, bb all captured; antes are recorded as action 'antes' since they are not part of the betting
     dealt_re = re.compile(r"Dealt to (?P<player>\S+) \[(?P<cards>[\w\s]+)\]")
-    street_re = re.compile(r"\*\*\* (?P<street>HOLE CARDS|FLOP|TURN|RIVER) \*\*\*(?: \[(?P<cards>[\w\s]+)\])?")
-    action_re = re.compile(r"(?P<player>\S+): (?P<action>folds|checks|calls|bets|raises)(?: (?P<amount>[\d\.]+)(?: to (?P<to>[\d\.]+))?)?")
+    # TURN/RIVER lines repeat the earlier board, e.g. [2c 7d 9h] [Js]; the last bracket is the new card
+    street_re = re.compile(r"\*\*\* (?P<street>HOLE CARDS|FLOP|TURN|RIVER) \*\*\*(?: \[(?P<cards>[\w\s]+)\])*")
+    action_re = re.compile(r"(?P<player>\S+): (?P<action>folds|checks|calls|bets|raises)(?: \$?(?P<amount>[\d\.]+)(?: to \$?(?P<to>[\d\.]+))?)?")
     showdown_re = re.compile(r"(?P<player>\S+): shows \[(?P<cards>[\w\s]+)\]")
     win_re = re.compile(r"(?P<player>\S+) (?:collected|wins) \$?(?P<amount>[\d\.]+)")
+    uncalled_re = re.compile(r"Uncalled bet \(\$?(?P<amount>[\d\.]+)\) returned to (?P<player>\S+)")
 
     # Parse header
     m = header_re.match(header)
@@ -78,7 +82,8 @@ def parse_hand(hand_text: str) -> Hand:
             continue
         # Posts
         if (m := post_re.match(line)):
-            hand.posts.append(Action(street='PREFLOP', player=m.group('player'), action='posts', amount=float(m.group('amount'))))
+            action = 'antes' if m.group('kind') == 'the ante' else 'posts'
+            hand.posts.append(Action(street='PREFLOP', player=m.group('player'), action=action, amount=float(m.group('amount'))))
             continue
         # Dealt
         if (m := dealt_re.match(line)):
@@ -102,9 +107,9 @@ def parse_hand(hand_text: str) -> Hand:
             amt = None
             if m.group('to'):
                 amt = float(m.group('to'))
-            elif m.group('amt'):
-                amt = float(m.group('amt'))
-            hand.actions.append(Action(street=street, player=m.group('player'), action=m.group('action'), amout=amt))
+            elif m.group('amount'):
+                amt = float(m.group('amount'))
+            hand.actions.append(Action(street=street, player=m.group('player'), action=m.group('action'), amount=amt))
             continue
             
         # Showdown
@@ -116,8 +121,15 @@ def parse_hand(hand_text: str) -> Hand:
         if (m := win_re.match(line)):
             player = m.group('player')
             amt = float(m.group('amount'))
-            hand.win_amounts[player] = amt
-            hand.winners.append(player)
+            # main and side pots are collected on separate lines
+            hand.win_amounts[player] = hand.win_amounts.get(player, 0.0) + amt
+            if player not in hand.winners:
+                hand.winners.append(player)
+            continue
+
+        # Uncalled bets
+        if (m := uncalled_re.match(line)):
+            hand.uncalled[m.group('player')] = float(m.group('amount'))
             continue
 
     
@@ -44,11 +44,11 @@ class FileWatcher:
         self.file_path = os.path.abspath(file_path)
         self.dir_path = os.path.dirname(self.file_path)
         self.handler = HandHistoryHandler(self.file_path, new_hand_callback)
-        self.observer = Observer
+        self.observer = Observer()
         self.thread = None
 
     def start(self):
-        self.observer.schedule(self.handler, self.dir_path, recrusive=False)
+        self.observer.schedule(self.handler, self.dir_path, recursive=False)
         self.observer.start()
         self.thread = threading.Thread(target=self._monitor, daemon=True)
         self.thread.start()
@@ -0,0 +1,7 @@
+from pathlib import Path
+
+DATA_DIR = Path.home() / '.headsup'
+
+# StatsManager warm-start snapshot, restored on launch
+SNAPSHOT_PATH = DATA_DIR / 'stats_snapshot.json'
+SNAPSHOT_EVERY = 50  # hands between snapshot writes
@@ -0,0 +1,321 @@
+"""
+End-to-end soak test: simulated tables -> FileWatcher -> app.on_new_hand_text.
+
+Each simulated table appends PokerStars hands to its own file in one history
+directory, exactly like the client does, and the app's own ingest callback
+picks them up, periodic snapshot writes included. The harness records
+per-hand latency (write -> stats updated), dropped and late hands, watcher
+queue depth and RSS, and writes a JSON report that can be diffed against a
+report from another version.
+
+    cd src && python -m soak.harness --tables 1,4,8,16 --rate 2 --duration 60 --out soak.json
+    cd src && python -m soak.harness --compare old.json new.json
+
+The snapshot goes to a scratch file next to the hand histories unless
+--snapshot points it somewhere else; the real one is never touched.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import psutil
+from loguru import logger
+
+import app
+from ingest.watch import FileWatcher
+from stats.calculator import StatsManager
+from stats.registry import HUD, FULL
+from soak.simulator import TableSimulator
+
+REPORT_VERSION = 1
+
+_HAND_ID_RE = re.compile(r"Hand #(\d+):")
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))]
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or 'unknown'
+    except Exception:
+        return 'unknown'
+
+
+class SoakRun:
+    """One soak step at a fixed number of tables."""
+    def __init__(self, hh_dir: str, tables: int, rate: float, duration: float, late_ms: float,
+                 drain: float, interval: float, profile: str, allin_rate: float, seed: int,
+                 snapshot: Optional[str] = None):
+        self.hh_dir = hh_dir
+        self.snapshot = snapshot or os.path.join(hh_dir, 'stats_snapshot.json')
+        self.tables = tables
+        self.rate = rate
+        self.duration = duration
+        self.late_ms = late_ms
+        self.drain = drain
+        self.interval = interval
+        self.allin_rate = allin_rate
+        self.seed = seed
+
+        self.projection = FULL if profile == 'full' else HUD
+        self.lock = threading.Lock()
+        self.written: Dict[str, float] = {}    # hand id -> write time
+        self.latency: Dict[str, float] = {}    # hand id -> seconds until stats updated
+        self.parse_errors = 0
+        self.behind = 0                        # writer ticks that fired late
+        self.samples: List[Dict[str, Any]] = []
+        self.watchers: List[FileWatcher] = []
+        self._stop = threading.Event()
+        self._proc = psutil.Process()
+
+    # ─── Ingest side ───────────────────────────────────────────
+
+    def on_new_hand_text(self, hand_text: str):
+        m = _HAND_ID_RE.search(hand_text)
+        # watcher threads call in concurrently; the app callback is not thread-safe
+        with self.lock:
+            before = app.stats.hands_seen
+            app.on_new_hand_text(hand_text)
+            # the callback logs and swallows its own errors
+            if m is None or app.stats.hands_seen == before:
+                self.parse_errors += 1
+                return
+            t0 = self.written.get(m.group(1))
+            if t0 is not None:
+                self.latency[m.group(1)] = time.monotonic() - t0
+
+    # ─── Writer side ───────────────────────────────────────────
+
+    def _write_table(self, sim: TableSimulator, path: str):
+        period = 1.0 / self.rate
+        start = time.monotonic() + sim.rng.random() * period  # spread tables out
+        n = 0
+        while not self._stop.is_set():
+            due = start + n * period
+            now = time.monotonic()
+            if due > now:
+                if self._stop.wait(due - now):
+                    break
+            elif now - due > period:
+                with self.lock:
+                    self.behind += 1
+            hand_id, text = sim.next_hand()
+            with self.lock:
+                self.written[hand_id] = time.monotonic()
+            # hands are separated by blank lines, the way the client writes them
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(text + "\n\n\n")
+            n += 1
+
+    def _sample(self, t0: float):
+        with self.lock:
+            written, done, errors = len(self.written), len(self.latency), self.parse_errors
+        queue = 0
+        for w in self.watchers:
+            try:
+                queue += w.observer.event_queue.qsize()
+            except (AttributeError, NotImplementedError):
+                pass
+        self.samples.append({
+            't': round(time.monotonic() - t0, 2),
+            'written': written,
+            'processed': done,
+            'backlog': written - done - errors,
+            'event_queue': queue,
+            'rss_mb': round(self._proc.memory_info().rss / 2**20, 1),
+        })
+
+    # ─── Driver ────────────────────────────────────────────────
+
+    def run(self) -> Dict[str, Any]:
+        saved = app.stats, app.SNAPSHOT_PATH
+        app.stats, app.SNAPSHOT_PATH = StatsManager(self.projection), Path(self.snapshot)
+        try:
+            return self._run()
+        finally:
+            # stop the snapshot writer and drop this step's calculators before the next step
+            app.stats.close()
+            app.stats, app.SNAPSHOT_PATH = saved
+            gc.collect()
+
+    def _run(self) -> Dict[str, Any]:
+        sims = []
+        for i in range(self.tables):
+            path = os.path.join(self.hh_dir, f"HH_soak_table{i + 1:03d}.txt")
+            open(path, 'w').close()
+            sims.append((TableSimulator(f"Soak {i + 1}", seed=self.seed + i + 1, allin_rate=self.allin_rate), path))
+            watcher = FileWatcher(path, self.on_new_hand_text)
+            watcher.start()
+            self.watchers.append(watcher)
+
+        writers = [threading.Thread(target=self._write_table, args=(sim, path), daemon=True) for sim, path in sims]
+        t0 = time.monotonic()
+        for w in writers:
+            w.start()
+        while time.monotonic() - t0 < self.duration:
+            time.sleep(self.interval)
+            self._sample(t0)
+        self._stop.set()
+        for w in writers:
+            w.join()
+
+        # let the watchers catch up before counting drops
+        t_end = time.monotonic()
+        while time.monotonic() - t_end < self.drain:
+            with self.lock:
+                if len(self.latency) + self.parse_errors >= len(self.written):
+                    break
+            time.sleep(0.1)
+        self._sample(t0)
+        for w in self.watchers:
+            w.stop()
+        return self.report(time.monotonic() - t0)
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        lat_ms = [v * 1000 for v in self.latency.values()]
+        written = len(self.written)
+        dropped = written - len(self.latency) - self.parse_errors
+        late = sum(1 for v in lat_ms if v > self.late_ms)
+        p95 = _percentile(lat_ms, 95)
+        return {
+            'tables': self.tables,
+            'summary': {
+                'hands_written': written,
+                'hands_processed': len(self.latency),
+                'parse_errors': self.parse_errors,
+                'dropped': dropped,
+                'late': late,
+                'writer_behind': self.behind,
+                'throughput_hps': round(len(self.latency) / elapsed, 2) if elapsed else 0.0,
+                'latency_ms': {
+                    'p50': round(_percentile(lat_ms, 50), 1),
+                    'p95': round(p95, 1),
+                    'p99': round(_percentile(lat_ms, 99), 1),
+                    'max': round(max(lat_ms, default=0.0), 1),
+                },
+                'max_backlog': max((s['backlog'] for s in self.samples), default=0),
+                'max_event_queue': max((s['event_queue'] for s in self.samples), default=0),
+                'rss_mb_start': self.samples[0]['rss_mb'] if self.samples else 0.0,
+                'rss_mb_end': self.samples[-1]['rss_mb'] if self.samples else 0.0,
+                'players_tracked': len(app.stats.by_player),
+                'sustained': dropped == 0 and self.parse_errors == 0 and p95 <= self.late_ms,
+            },
+            'samples': self.samples,
+        }
+
+
+def run_soak(tables: List[int], rate: float, duration: float, late_ms: float = 1000.0, drain: float = 10.0,
+             interval: float = 1.0, profile: str = 'hud', allin_rate: float = 0.05, seed: int = 0,
+             hh_dir: Optional[str] = None, label: Optional[str] = None,
+             snapshot: Optional[str] = None) -> Dict[str, Any]:
+    """Run one soak step per table count and return the combined report."""
+    config = {'tables': tables, 'rate': rate, 'duration': duration, 'late_ms': late_ms, 'drain': drain,
+              'interval': interval, 'profile': profile, 'allin_rate': allin_rate, 'seed': seed}
+    runs = []
+    for n in tables:
+        with tempfile.TemporaryDirectory(prefix='headsup-soak-', dir=hh_dir) as d:
+            logger.info(f"Soak: {n} tables x {rate} hands/s for {duration:.0f}s")
+            res = SoakRun(d, n, rate, duration, late_ms, drain, interval, profile, allin_rate, seed,
+                          snapshot).run()
+            s = res['summary']
+            logger.info(f"  {s['throughput_hps']} hands/s, p95 {s['latency_ms']['p95']} ms, "
+                        f"dropped {s['dropped']}, late {s['late']}, rss {s['rss_mb_end']} MB")
+            runs.append(res)
+
+    # the largest count that held up along with every smaller count tested
+    max_sustained = 0
+    for r in sorted(runs, key=lambda r: r['tables']):
+        if not r['summary']['sustained']:
+            break
+        max_sustained = r['tables']
+    return {
+        'report_version': REPORT_VERSION,
+        'label': label or _git_rev(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'env': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'config': config,
+        'max_sustained_tables': max_sustained,
+        'runs': runs,
+    }
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any]) -> str:
+    """Side-by-side summary of two soak reports, matched on table count."""
+    rows = [f"{'tables':>6}  {'hands/s':>17}  {'p95 ms':>17}  {'dropped':>11}  {'rss MB':>15}"]
+    old_runs = {r['tables']: r['summary'] for r in old['runs']}
+    for r in new['runs']:
+        a, b = old_runs.get(r['tables']), r['summary']
+        if a is None:
+            continue
+        rows.append(f"{r['tables']:>6}  {a['throughput_hps']:>8} {b['throughput_hps']:>8}  "
+                    f"{a['latency_ms']['p95']:>8} {b['latency_ms']['p95']:>8}  "
+                    f"{a['dropped']:>5} {b['dropped']:>5}  {a['rss_mb_end']:>7} {b['rss_mb_end']:>7}")
+    rows.append(f"max sustained tables: {old['max_sustained_tables']} ({old['label']}) -> "
+                f"{new['max_sustained_tables']} ({new['label']})")
+    return "\n".join(rows)
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="HeadsUp end-to-end soak test")
+    ap.add_argument('--tables', default='1,2,4,8', help="comma-separated table counts, one run each")
+    ap.add_argument('--rate', type=float, default=1.0, help="hands per second per table")
+    ap.add_argument('--duration', type=float, default=30.0, help="seconds per run")
+    ap.add_argument('--late-ms', type=float, default=1000.0, help="latency above which a hand counts as late")
+    ap.add_argument('--drain', type=float, default=10.0, help="seconds to wait for stragglers after writing stops")
+    ap.add_argument('--interval', type=float, default=1.0, help="sampling interval in seconds")
+    ap.add_argument('--profile', choices=('hud', 'full'), default='hud', help="StatsManager projection")
+    ap.add_argument('--allin-rate', type=float, default=0.05, help="share of hands that are preflop all-ins")
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--dir', default=None, help="parent directory for the simulated hand history files")
+    ap.add_argument('--snapshot', default=None,
+                    help="stats snapshot path written during the run (default: a scratch file per run)")
+    ap.add_argument('--label', default=None, help="version label for the report (default: git revision)")
+    ap.add_argument('--out', default=None, help="write the JSON report here")
+    ap.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help="compare two reports and exit")
+    args = ap.parse_args(argv)
+
+    # the app logs every parsed hand at DEBUG
+    logger.remove()
+    logger.add(sys.stderr, level='INFO')
+
+    if args.compare:
+        with open(args.compare[0]) as f_old, open(args.compare[1]) as f_new:
+            print(compare(json.load(f_old), json.load(f_new)))
+        return
+
+    report = run_soak([int(n) for n in args.tables.split(',')], args.rate, args.duration, args.late_ms,
+                      args.drain, args.interval, args.profile, args.allin_rate, args.seed, args.dir, args.label,
+                      args.snapshot)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Report written to {args.out}")
+    else:
+        json.dump({k: v for k, v in report.items() if k != 'runs'} |
+                  {'runs': [{'tables': r['tables'], 'summary': r['summary']} for r in report['runs']]},
+                  sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from stats.equity import RANKS, SUITS, card_index, evaluate, side_pots
+
+STREETS = ('FLOP', 'TURN', 'RIVER')
+PLAYER_POOL = [f"reg{i:03d}" for i in range(300)]
+
+
+def _money(x: float) -> str:
+    return f"${x:.2f}"
+
+
+class TableSimulator:
+    """
+    Deals random but well-formed PokerStars cash-game hands for one table.
+
+    `next_hand` returns the text of each hand; writing it out is up to the
+    caller. Players are drawn from a shared pool so the same names show up
+    across tables.
+    """
+    def __init__(self, table: str, seed: int = 0, sb: float = 0.05, bb: float = 0.10,
+                 seats: int = 6, allin_rate: float = 0.05):
+        self.table = table
+        self.rng = random.Random(seed)
+        self.sb, self.bb = sb, bb
+        self.max_seats = seats
+        self.allin_rate = allin_rate
+        self.hand_no = seed * 10**9
+        self.button = 1
+        self.players: Dict[int, str] = dict(zip(range(1, seats + 1), self.rng.sample(PLAYER_POOL, seats)))
+        self.stacks: Dict[int, float] = {s: 100 * bb for s in self.players}
+
+    def next_hand(self) -> Tuple[str, str]:
+        rng = self.rng
+        self.hand_no += 1
+        hand_id = str(self.hand_no)
+
+        # occasional seat change, and busted players rebuy
+        if rng.random() < 0.02:
+            seat = rng.choice(list(self.players))
+            self.players[seat] = rng.choice([n for n in PLAYER_POOL if n not in self.players.values()])
+            self.stacks[seat] = 100 * self.bb
+        for s in self.stacks:
+            if self.stacks[s] < 20 * self.bb:
+                self.stacks[s] = 100 * self.bb
+        self.button = self.button % self.max_seats + 1
+
+        seats = sorted(self.players)
+        order = seats[seats.index(self.button) + 1:] + seats[:seats.index(self.button) + 1]  # SB .. BTN
+        name = {s: self.players[s] for s in seats}
+        deck = [r + s for r in RANKS for s in SUITS]
+        rng.shuffle(deck)
+        holes = {s: [deck.pop(), deck.pop()] for s in seats}
+        board = [deck.pop() for _ in range(5)]
+
+        lines = [
+            f"PokerStars Hand #{hand_id}:  Hold'em No Limit ({_money(self.sb)}/{_money(self.bb)} USD) - "
+            f"{time.strftime('%Y/%m/%d %H:%M:%S')} ET",
+            f"Table '{self.table}' {self.max_seats}-max Seat #{self.button} is the button",
+        ]
+        lines += [f"Seat {s}: {name[s]} ({_money(self.stacks[s])} in chips)" for s in seats]
+
+        put: Dict[int, float] = {s: 0.0 for s in seats}
+        sb_seat, bb_seat = order[0], order[1]
+        lines.append(f"{name[sb_seat]}: posts small blind {_money(self.sb)}")
+        lines.append(f"{name[bb_seat]}: posts big blind {_money(self.bb)}")
+        put[sb_seat], put[bb_seat] = self.sb, self.bb
+
+        lines.append("*** HOLE CARDS ***")
+        hero = seats[0]
+        lines.append(f"Dealt to {name[hero]} [{' '.join(holes[hero])}]")
+
+        live = list(order[2:] + order[:2])  # UTG first preflop
+        allin = False
+        if rng.random() < self.allin_rate:
+            live, allin = self._allin_preflop(lines, live, name, put)
+        else:
+            live = self._betting_round(lines, live, name, put, to_call=self.bb, raise_p=0.15, fold_p=0.55)
+
+        shown = 0
+        for i, st in enumerate(STREETS):
+            if len(live) < 2:
+                break
+            cards = board[:3 + i]
+            prev = f"[{' '.join(cards[:-1])}] " if i else ""
+            lines.append(f"*** {st} *** {prev}[{' '.join(cards[-1:] if i else cards)}]")
+            shown = 3 + i
+            if not allin:
+                live = [s for s in order if s in live]  # SB first postflop
+                live = self._betting_round(lines, live, name, put, to_call=0.0, raise_p=0.3, fold_p=0.35)
+
+        pot = round(sum(put.values()), 2)
+        won: Dict[int, float] = {}
+        if len(live) >= 2:
+            lines.append("*** SHOW DOWN ***")
+            values = evaluate(np.array([[card_index(c) for c in holes[s] + board] for s in live]))
+            value = dict(zip(live, values))
+            for s in live:
+                lines.append(f"{name[s]}: shows [{' '.join(holes[s])}]")
+            # a short all-in only plays for the main pot
+            pots = side_pots(put, live)
+            for i, (amount, eligible) in enumerate(pots):
+                best = max(value[s] for s in eligible)
+                winners = [s for s in eligible if value[s] == best]
+                label = "pot" if len(pots) == 1 else "main pot" if i == 0 else f"side pot-{i}"
+                for s in winners:
+                    share = round(amount / len(winners), 2)
+                    won[s] = won.get(s, 0.0) + share
+                    lines.append(f"{name[s]} collected {_money(share)} from {label}")
+        else:
+            won[live[0]] = pot
+            lines.append(f"{name[live[0]]} collected {_money(pot)} from pot")
+
+        for s in seats:
+            self.stacks[s] = round(self.stacks[s] - put[s] + won.get(s, 0.0), 2)
+
+        lines.append("*** SUMMARY ***")
+        lines.append(f"Total pot {_money(pot)} | Rake $0")
+        if shown:
+            lines.append(f"Board [{' '.join(board[:shown])}]")
+        return hand_id, "\n".join(lines)
+
+    def _allin_preflop(self, lines: List[str], live: List[int], name: Dict[int, str],
+                       put: Dict[int, float]) -> Tuple[List[int], bool]:
+        shover = self.rng.choice(live)
+        amount = self.stacks[shover]
+        lines.append(f"{name[shover]}: raises {_money(amount - self.bb)} to {_money(amount)} and is all-in")
+        put[shover] = amount
+        callers = [shover]
+        for s in live:
+            if s == shover:
+                continue
+            if len(callers) < 3 and self.rng.random() < 0.4:
+                call = min(amount, self.stacks[s]) - put[s]
+                lines.append(f"{name[s]}: calls {_money(call)}" + (" and is all-in" if amount >= self.stacks[s] else ""))
+                put[s] += call
+                callers.append(s)
+            else:
+                lines.append(f"{name[s]}: folds")
+        # refund whatever nobody matched, e.g. when every caller was shorter
+        refund = round(amount - max(v for s, v in put.items() if s != shover), 2)
+        if refund > 0:
+            put[shover] -= refund
+            lines.append(f"Uncalled bet ({_money(refund)}) returned to {name[shover]}")
+        return callers, len(callers) > 1
+
+    def _betting_round(self, lines: List[str], live: List[int], name: Dict[int, str], put: Dict[int, float],
+                       to_call: float, raise_p: float, fold_p: float) -> List[int]:
+        """One orbit of random actions, then players facing a raise call or fold."""
+        rng = self.rng
+        street_put = {s: 0.0 for s in live}
+        if to_call:  # preflop blinds already in
+            street_put.update({s: put[s] for s in live})
+        bet = to_call
+        raiser: Optional[int] = None
+        remaining = list(live)
+        for s in live:
+            if len(remaining) == 1:
+                break
+            owed = bet - street_put[s]
+            r = rng.random()
+            if r < raise_p and self.stacks[s] - put[s] > 3 * max(bet, self.bb):
+                new = round(max(bet, self.bb) * 3 if bet else self.bb * rng.choice((2, 3, 4)), 2)
+                verb = "raises" if bet else "bets"
+                text = f"{_money(new - bet)} to {_money(new)}" if bet else _money(new)
+                lines.append(f"{name[s]}: {verb} {text}")
+                put[s] += new - street_put[s]
+                street_put[s] = new
+                bet, raiser = new, s
+            elif owed <= 0:
+                lines.append(f"{name[s]}: checks")
+            elif r < raise_p + fold_p:
+                lines.append(f"{name[s]}: folds")
+                remaining.remove(s)
+            else:
+                lines.append(f"{name[s]}: calls {_money(owed)}")
+                put[s] += owed
+                street_put[s] = bet
+
+        for s in list(remaining):
+            if len(remaining) == 1:
+                break
+            owed = round(bet - street_put[s], 2)
+            if s == raiser or owed <= 0:
+                continue
+            if rng.random() < 0.5:
+                lines.append(f"{name[s]}: folds")
+                remaining.remove(s)
+            else:
+                lines.append(f"{name[s]}: calls {_money(owed)}")
+                put[s] += owed
+                street_put[s] = bet
+
+        if len(remaining) == 1 and raiser is not None and raiser in remaining:
+            others = max((v for k, v in street_put.items() if k != raiser), default=0.0)
+            refund = round(street_put[raiser] - others, 2)
+            if refund > 0:
+                put[raiser] -= refund
+                lines.append(f"Uncalled bet ({_money(refund)}) returned to {name[raiser]}")
+        return remaining
@@ -1,5 +1,47 @@
-from typing import Dict, Any
+import copy
+import json
+import os
+import re
+import threading
+from collections import deque
+from typing import Dict, Any, List, Optional
+from loguru import logger
 from ingest.parser import Hand, Action
+from stats.registry import COUNTERS, STATS, Projection, FULL
+
+
+def _merge(base: Dict[str, Any], saved: Dict[str, Any]) -> Dict[str, Any]:
+    """Overlay saved counters on fresh ones key by key, so counters added since keep their zero."""
+    out = dict(base)
+    for k, v in saved.items():
+        out[k] = _merge(base[k], v) if isinstance(v, dict) and isinstance(base.get(k), dict) else v
+    return out
+
+
+def _invested(hand: Hand, player: str) -> float:
+    """Money `player` put into the pot: antes, blinds and calls/bets/raises, less any uncalled bet."""
+    total = 0.0
+    street, street_put = 'PREFLOP', 0.0
+    for a in hand.posts:
+        if a.player != player:
+            continue
+        if a.action == 'antes':
+            # dead money: a raise-to total only covers the blind
+            total += a.amount or 0.0
+        else:
+            street_put += a.amount or 0.0
+    for a in hand.actions:
+        if a.player != player:
+            continue
+        if a.street != street:
+            total += street_put
+            street, street_put = a.street, 0.0
+        if a.action in ('calls', 'bets'):
+            street_put += a.amount or 0.0
+        elif a.action == 'raises':
+            # raise amounts are "to" totals for the street
+            street_put = a.amount or street_put
+    return total + street_put - hand.uncalled.get(player, 0.0)
 
 
 class StatsCalculator:
@@ -7,12 +49,15 @@ class StatsCalculator:
     PO_POS = ('IP', 'OOP')
     POSITIONS = ('BB', 'SB', 'BTN', 'CO', 'MP', 'EP')
 
-    def __init__(self, player_name: str):
+    def __init__(self, player_name: str, projection: Projection = FULL):
         self.player = player_name
+        self.projection = projection
+        self.features = projection.features
 
         # ─── Summary ───────────────────────────────────────────
         self.hands_played: int = 0
-        self.total_bb_won: float = 0.0
+        self.total_bb_won: float = 0.0      # net: collected minus invested
+        self.total_ev_bb_won: float = 0.0   # net, all-in hands credited at equity * pot
         self.big_blind_size: float = 0.0
         self.current_stack: float = 0.0
 
@@ -25,7 +70,7 @@ class StatsCalculator:
         # blind steal attempts, fold to steal, called steal, resteal, fold to resteal
         self.steal_by_pos: Dict[int, Dict[str,int]] = {}
 
-        self.postflop_street = {st : {k: 0 for k in ('bets', 'raises', 'calls', 'cr', 'fcr', 'cbet', 'fcb', 'rcb', 'frcb', 'cbet_3', 'fcb_3', 'db', 'fdb', 'cdb', 'wts', 'was', 'wws')} for st in self.STREETS}
+        self.postflop_street = {st : {k: 0 for k in ('bets', 'raises', 'calls', 'cr', 'fcr', 'cbet', 'fcb', 'rcb', 'frcb', 'cbet3', 'fcb3', 'donk', 'fdb', 'cdb', 'wts', 'was', 'wws')} for st in self.STREETS}
         # bets, raises, calls, check raise, fold to check raise, cbet, fold to cbet, raise cbet, fold to raise cbet, cbet on 3bet, fold to cbet on 3bet, donk bet, fold to donk bet, call donk bet, went to showdown, won at showdown, won without showdown
         self.postflop_pos: Dict[str, Dict[str,int]] = {po: {'bets':0, 'raises':0, 'calls':0} for po in self.PO_POS}
 
@@ -34,28 +79,90 @@ class StatsCalculator:
         return list(range(2, n+1)) + [1]
 
     def reset(self):
-        self.__init__(self.player)
+        self.__init__(self.player, self.projection)
+
+    # per-position counter templates
+    _BY_POS = {'seen':0, 'vpip':0, 'pfr':0, '3bet':0}
+    _STEAL_BY_POS = {'bsa':0, 'fb':0, 'cs':0, 'rs':0, 'fr':0}
+
+    # persisted for every projection; the rest follows projection.counters
+    _BASE_STATE = ('hands_played', 'big_blind_size', 'current_stack')
+    _STATE = ('big_blind_size', 'current_stack') + COUNTERS
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The counters this calculator's projection reads, JSON-serialisable."""
+        keep = self.projection.counters
+        return {k: getattr(self, k) for k in self._STATE if k in self._BASE_STATE or k in keep}
+
+    @classmethod
+    def from_dict(cls, player_name: str, state: Dict[str, Any], projection: Projection = FULL) -> 'StatsCalculator':
+        calc = cls(player_name, projection)
+        for k in cls._STATE:
+            if k not in state:
+                continue
+            v = state[k]
+            if k in ('by_pos', 'steal_by_pos'):
+                # json turns the int position keys into strings
+                template = cls._BY_POS if k == 'by_pos' else cls._STEAL_BY_POS
+                v = {int(pos): {**template, **counts} for pos, counts in v.items()}
+            elif isinstance(v, dict):
+                v = _merge(getattr(calc, k), v)
+            setattr(calc, k, v)
+        return calc
 
     def update_with_hand(self, hand: Hand):
-        """Tally counters for this player from a parsed Hand."""
+        """Tally counters for this player from a parsed Hand, running only the rules the projection needs."""
+        feats = self.features
         if not self.big_blind_size:
-            self.big_blind_size = float(hand.stakes.replace('$', '').split('/')[-1])
+            # "$0.05/$0.10" or "Hold'em No Limit ($0.05/$0.10 USD)"
+            self.big_blind_size = float(re.search(r"/\$?([\d.]+)", hand.stakes).group(1))
         for p in hand.players:
             if p.name == self.player:
                 self.current_stack = p.stack
-                won = hand.win_amounts.get(self.player, 0.0)
-                self.total_bb_won += (won / self.big_blind_size)
                 pos_id = p.pos_id or 1
                 break
 
         self.hands_played += 1
 
-        # preflop
-        pf = [a for a in hand.actions if a.street == 'PREFLOP']
+        if 'results' in feats or 'ev' in feats:
+            self._tally_results(hand, feats)
 
-        self.by_pos.setdefault(pos_id, {'seen':0, 'vpip':0, 'pfr':0, '3bet':0})
-        self.by_pos[pos_id]['seen'] += 1
+        pf = [a for a in hand.actions if a.street == 'PREFLOP']
+        raises_all = [a for a in pf if a.action == 'raises']
 
+        if 'preflop' in feats or 'raises' in feats:
+            self.by_pos.setdefault(pos_id, dict(self._BY_POS))
+            self.by_pos[pos_id]['seen'] += 1
+        if 'preflop' in feats:
+            self._tally_preflop(hand, pf, pos_id)
+        if 'raises' in feats:
+            self._tally_raises(pf, raises_all, pos_id)
+        if 'steal' in feats and pos_id in (1,2):
+            self._tally_steal(pf, pos_id)
+        if feats & {'postflop_actions', 'postflop_pos', 'postflop_lines'}:
+            self._tally_postflop(hand, pf, raises_all, feats)
+        if 'showdown' in feats:
+            self._tally_showdown(hand)
+
+    # ─── Rule groups (see stats.registry.FEATURES) ─────────────
+
+    def _tally_results(self, hand: Hand, feats):
+        invested = _invested(hand, self.player)
+        won = hand.win_amounts.get(self.player, 0.0)
+        if 'results' in feats:
+            self.total_bb_won += (won - invested) / self.big_blind_size
+        if 'ev' in feats:
+            # the equity engine pulls in numpy; only projections with `ev` pay for it
+            from stats.equity import allin_equity
+
+            eq = None
+            if len(hand.showdown) >= 2:
+                eq = allin_equity(hand, {p.name: _invested(hand, p.name) for p in hand.players})
+            if eq and self.player in eq:
+                won = eq[self.player] * sum(hand.win_amounts.values())
+            self.total_ev_bb_won += (won - invested) / self.big_blind_size
+
+    def _tally_preflop(self, hand: Hand, pf, pos_id: int):
         if any(a.player == self.player and a.action in ('calls', 'raises', 'bets') for a in pf):
             self.preflop['vpip'] += 1
             self.by_pos[pos_id]['vpip'] += 1
@@ -73,7 +180,7 @@ class StatsCalculator:
         if (any(a.player == self.player and a.action == 'raises' for a in pf) and not any (a.player != self.player and a.action == 'raises' for a in pf)):
             self.preflop['uopfr'] += 1
 
-        raises_all = [a for a in pf if a.action == 'raises']
+    def _tally_raises(self, pf, raises_all, pos_id: int):
         ours = [a for a in raises_all if a.player == self.player]
 
         if len(raises_all) >= 2 and ours:
@@ -104,33 +211,37 @@ class StatsCalculator:
                 if len(raises_all) >= 3 and raises_all[2].player == self.player:
                     self.preflop['fsqc'] += 1
 
-        # steal
-        if pos_id in (1,2):
-            if any(a.player == self.player and a.action == 'raises' for a in pf):
-                self.steal['bsa'] += 1
-                self.steal_by_pos.setdefault(pos_id, {'bsa':0, 'fb':0, 'cs':0, 'rs':0, 'fr':0})
-                self.steal_by_pos[pos_id]['bsa'] += 1
-            if any(a.player == self.player and a.action == 'folds' for a in pf):
-                if any(a.action == 'raises' and a.player != self.player for a in pf):
-                    self.steal['fb'] += 1
-                    self.steal_by_pos[pos_id]['fb'] += 1
-            if any(a.player == self.player and a.action == 'calls' for a in pf) and not any(x.action == 'posts' for x in pf if x.player == self.player):
-                if any(a.action == 'raises' and a.player != self.player for a in pf):
-                    self.steal['cs'] += 1
-                    self.steal_by_pos[pos_id]['cs'] = self.steal_by_pos.get(pos_id, {}).get('cs', 0) + 1
-            if any(a.action == self.player and a.action == 'raises' for a in pf) and any(x.action == 'raises' and x.player != self.player for x in pf):
-                self.steal['rs'] += 1
-                self.steal_by_pos[pos_id]['rs'] = self.steal_by_pos.get(pos_id, {}).get('fr', 0) + 1
-            if any(a.player == self.player and a.action == 'folds' for a in pf) and len([x for x in pf if x.action == 'raises']) >= 2:
-                self.steal['fr'] += 1
-                self.steal_by_pos[pos_id]['fr'] = self.steal_by_pos.get(pos_id, {}).get('fr', 0) + 1
-        
-        # postflop
+    def _tally_steal(self, pf, pos_id: int):
+        by_pos = self.steal_by_pos.setdefault(pos_id, dict(self._STEAL_BY_POS))
+        if any(a.player == self.player and a.action == 'raises' for a in pf):
+            self.steal['bsa'] += 1
+            by_pos['bsa'] += 1
+        if any(a.player == self.player and a.action == 'folds' for a in pf):
+            if any(a.action == 'raises' and a.player != self.player for a in pf):
+                self.steal['fb'] += 1
+                by_pos['fb'] += 1
+        if any(a.player == self.player and a.action == 'calls' for a in pf) and not any(x.action == 'posts' for x in pf if x.player == self.player):
+            if any(a.action == 'raises' and a.player != self.player for a in pf):
+                self.steal['cs'] += 1
+                by_pos['cs'] += 1
+        if any(a.player == self.player and a.action == 'raises' for a in pf) and any(x.action == 'raises' and x.player != self.player for x in pf):
+            self.steal['rs'] += 1
+            by_pos['rs'] += 1
+        if any(a.player == self.player and a.action == 'folds' for a in pf) and len([x for x in pf if x.action == 'raises']) >= 2:
+            self.steal['fr'] += 1
+            by_pos['fr'] += 1
+
+    def _tally_postflop(self, hand: Hand, pf, raises_all, feats):
+        do_actions = 'postflop_actions' in feats
+        do_pos = 'postflop_pos' in feats
+        do_lines = 'postflop_lines' in feats
+
         pf_aggs = [a for a in pf if a.action in ('bets', 'raises')]
         last_pf_agg = pf_aggs[-1].player if pf_aggs else None
         pf_3bpot = len(raises_all) >= 2
 
         actor_order = self._actor_order(hand)
+        pos_of = {pl.name: pl.pos_id or 1 for pl in hand.players}
 
         for st in self.STREETS:
             st_acts = [a for a in hand.actions if a.street == st]
@@ -143,15 +254,20 @@ class StatsCalculator:
                 prev_aggs = [x for x in st_aggs if st_acts.index(x) < idx]
                 last_agg = prev_aggs[-1] if prev_aggs else None
 
-                if last_agg:
-                    me_idx = actor_order.index(p.pos_idx)
-                    la_idx = actor_order.index(last_agg.pos_id)
-                    po = 'IP' if me_idx > la_idx else 'OOP'
-                else:
-                    po = 'IP'
-                self.postflop_pos[po][a.action] += 1
-
-                self.postflop_street[st][a.action] += 1 
+                if a.action in ('bets', 'raises', 'calls'):
+                    if do_pos:
+                        if last_agg:
+                            me_idx = actor_order.index(pos_of[self.player])
+                            la_idx = actor_order.index(pos_of[last_agg.player])
+                            po = 'IP' if me_idx > la_idx else 'OOP'
+                        else:
+                            po = 'IP'
+                        self.postflop_pos[po][a.action] += 1
+                    if do_actions:
+                        self.postflop_street[st][a.action] += 1 
+
+                if not do_lines:
+                    continue
 
                 if a.action == 'raises':
                     my_acts = [x for x in st_acts if x.player == self.player]
@@ -188,6 +304,8 @@ class StatsCalculator:
                 if a.action=='calls' and last_agg and last_pf_agg!=self.player and last_agg.action=='bets':
                     self.postflop_street[st]['cdb'] +=1
 
+    def _tally_showdown(self, hand: Hand):
+        for st in self.STREETS:
             if self.player in hand.showdown:
                 self.postflop_street[st]['wts'] +=1
                 if self.player in hand.winners:
@@ -195,118 +313,206 @@ class StatsCalculator:
             elif self.player in hand.winners:
                 self.postflop_street[st]['wws'] +=1
 
-    def compute_stats(self) -> Dict[str,Any]:
-        """Return nested stats for GUI consumption."""
-        hp = max(self.hands_played,1)
-
-        pf_ov = {
-            'VPIP%':  self.preflop['vpip']/hp*100,
-            'PFR%':   self.preflop['pfr']/hp*100,
-            'FS%':    self.preflop['fs']/hp*100,
-            'CPFR%':  self.preflop['cpfr']/hp*100,
-            'UOPR%':  self.preflop['uopr']/hp*100,
-            '3B%':    self.preflop['3bet']/hp*100,
-            '4B%':    self.preflop['4bet']/hp*100,
-        }
-        pf_bp = {
-            pos: {
-                'Seen': self.by_pos[pos]['seen'],
-                'VPIP%': self.by_pos[pos]['vpip']/max(self.by_pos[pos]['seen'],1)*100,
-                'PFR%':  self.by_pos[pos]['pfr']/max(self.by_pos[pos]['seen'],1)*100,
-                '3B%':   self.by_pos[pos]['3bet']/max(self.by_pos[pos]['seen'],1)*100,
-            }
-            for pos in sorted(self.by_pos)
-        }
-
-        st_ov = {
-            'BSA%': self.steal['bsa']/hp*100,
-            'FB%':  self.steal['fb']/hp*100,
-            'CS%':  self.steal['cs']/hp*100,
-            'RS%':  self.steal['rs']/hp*100,
-            'FR%':  self.steal['fr']/hp*100,
-        }
-        st_bp = {
-            pos: {
-                'BSA%': self.steal_by_pos[pos]['bsa']/hp*100,
-                'FB%':  self.steal_by_pos[pos]['fb']/hp*100,
-                'CS%':  self.steal_by_pos[pos].get('cs',0)/hp*100,
-                'RS%':  self.steal_by_pos[pos].get('rs',0)/hp*100,
-                'FR%':  self.steal_by_pos[pos].get('fr',0)/hp*100,
-            }
-            for pos in sorted(self.steal_by_pos)
-        }
-
-        tot_b = sum(self.postflop_street[s]['bets']   for s in self.STREETS)
-        tot_r = sum(self.postflop_street[s]['raises'] for s in self.STREETS)
-        tot_c = sum(self.postflop_street[s]['calls']  for s in self.STREETS)
-
-        pf_overall = {
-            'Agg%': (tot_b+tot_r)/tot_c*100 if tot_c else 0,
-            'AF':   (tot_b+tot_r)/tot_c     if tot_c else 0,
-            'WTS%': sum(self.postflop_street[s]['wts'] for s in self.STREETS)/hp*100,
-            'WAS%': sum(self.postflop_street[s]['was'] for s in self.STREETS)/hp*100,
-            'WWS%': sum(self.postflop_street[s]['wws'] for s in self.STREETS)/hp*100,
-        }
-
-        pf_bs = {
-            st: {
-                'Bet%':   self.postflop_street[st]['bets']/hp*100,
-                'Raise%': self.postflop_street[st]['raises']/hp*100,
-                'Call%':  self.postflop_street[st]['calls']/hp*100,
-                'CR%':    self.postflop_street[st]['cr']/hp*100,
-                'FCR%':   self.postflop_street[st]['fcr']/hp*100,
-                'CBet%':  self.postflop_street[st]['cbet']/hp*100,
-                'FCB%':   self.postflop_street[st]['fcb']/hp*100,
-                'RCB%':   self.postflop_street[st]['rcb']/hp*100,
-                'FRCB%':  self.postflop_street[st]['frcb']/hp*100,
-                'CBet3%': self.postflop_street[st]['cbet3']/hp*100,
-                'FCB3%':  self.postflop_street[st]['fcb3']/hp*100,
-                'DB%':    self.postflop_street[st]['donk']/hp*100,
-                'FDB%':   self.postflop_street[st]['fdb']/hp*100,
-                'CDB%':   self.postflop_street[st]['cdb']/hp*100,
-            }
-            for st in self.STREETS
-        }
-
-        pf_ip = {
-            po: {
-                'Bet%':   self.postflop_pos[po]['bets']/hp*100,
-                'Raise%': self.postflop_pos[po]['raises']/hp*100,
-                'Call%':  self.postflop_pos[po]['calls']/hp*100,
-            }
-            for po in self.PO_POS
-        }
-
-        return {
-            'Preflop':  {'overall': pf_ov, 'by_pos': pf_bp},
-            'Steal':    {'overall': st_ov, 'by_pos': st_bp},
-            'Postflop': {
-                'overall':   pf_overall,
-                'by_street': pf_bs,
-                'by_ip_oop': pf_ip
-            }
-        }
-
-
-            
-
+    def compute_stats(self, projection: Optional[Projection] = None) -> Dict[str,Any]:
+        """Return nested stats for GUI consumption, limited to the projection's stats."""
+        out: Dict[str, Any] = {}
+        for name in sorted((projection or self.projection).stats):
+            stat = STATS[name]
+            node = out
+            for key in stat.path[:-1]:
+                node = node.setdefault(key, {})
+            node[stat.path[-1]] = stat.compute(self)
+        return out
 
 
 class StatsManager:
     """
     one for each player
     """
-    def __init__(self):
+    FULL_HISTORY_MAX = 20000  # recent hands kept for building full profiles on demand
+
+    # bump whenever the counter schema changes; v2: cbet_3/fcb_3/db -> cbet3/fcb3/donk,
+    # v3: bb won is net of the player's investment, v4: records the projection and full profiles
+    SNAPSHOT_VERSION = 4
+
+    def __init__(self, projection: Projection = FULL):
+        self.projection = projection
+        if 'ev' in projection.features:
+            # build the evaluator tables now rather than on the first all-in
+            from stats.equity import prewarm
+            prewarm()
         self.by_player: Dict[str, StatsCalculator] = {}
+        self.hands_seen: int = 0
+
+        # With a narrower projection the popup-only full profiles are built on
+        # demand: ingest only appends to a bounded history, and full_stats()
+        # replays a player's hands from it when asked.
+        self.full_by_player: Dict[str, StatsCalculator] = self.by_player
+        self._history: deque = deque(maxlen=self.FULL_HISTORY_MAX)  # (hands_seen, hand)
+        self._replayed: Dict[str, int] = {}  # player -> last hands_seen in their full profile
+        self._history_lock = threading.Lock()
+        self._full_lock = threading.Lock()
+        if projection != FULL:
+            self.full_by_player = {}
+
+        # snapshot state: per-player copies as of the last snapshot, and who has changed since
+        self._saved: Dict[str, Dict[str, Any]] = {}
+        self._dirty: set = set()
+        self._file_lock = threading.Lock()
+        self._write_cv = threading.Condition()
+        self._write_req: Optional[tuple] = None
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
 
     def update_with_hand(self, hand: Hand):
-        # ensure every seat has a calculator
+        # ensure every seat has a calculator, then update only the seated players
         for pl in hand.players:
             if pl.name not in self.by_player:
-                self.by_player[pl.name] = StatsCalculator(pl.name)
-        # update each
-        for calc in self.by_player.values():
-            calc.update_with_hand(hand)
+                self.by_player[pl.name] = StatsCalculator(pl.name, self.projection)
+            self.by_player[pl.name].update_with_hand(hand)
+            self._dirty.add(pl.name)
+        self.hands_seen += 1
+        if self.projection != FULL:
+            with self._history_lock:
+                self._history.append((self.hands_seen, hand))
+
+    def _catch_up(self, name: str):
+        """Replay the hands `name` sat in since their full profile was last brought up to date."""
+        with self._history_lock:
+            if not self._history:
+                return
+            since = self._replayed.get(name, 0)
+            last = self._history[-1][0]
+            hands = [h for seq, h in self._history if seq > since and any(p.name == name for p in h.players)]
+        self._replayed[name] = last
+        if not hands:
+            return
+        calc = self.full_by_player.get(name) or StatsCalculator(name, FULL)
+        while True:
+            # replay on a copy so a hand that fails partway leaves no half-counted trace
+            trial = copy.deepcopy(calc)
+            for i, hand in enumerate(hands):
+                try:
+                    trial.update_with_hand(hand)
+                except Exception as e:
+                    logger.exception(f"Skipping hand {hand.hand_id} in the full profile of {name}: {e}")
+                    del hands[i]
+                    break
+            else:
+                self.full_by_player[name] = trial
+                return
+
+    def full_stats(self, name: str) -> Dict[str, Any]:
+        """
+        Every registered stat for one player, e.g. for the HUD popup.
+
+        With a narrower projection the profile is brought up to date from the
+        last FULL_HISTORY_MAX hands when asked; older hands only count if the
+        profile was built before they fell out of the history (or restored from
+        a snapshot). An unknown player gets the all-zero profile.
+        """
+        with self._full_lock:
+            if self.projection != FULL:
+                self._catch_up(name)
+            calc = self.full_by_player.get(name) or StatsCalculator(name, FULL)
+            return calc.compute_stats(FULL)
+
+    def _collect(self) -> Dict[str, Any]:
+        """
+        Copy the counters that changed since the last snapshot.
+
+        Cheap enough for the ingest thread: only players seated since then are
+        copied, the rest reuse their previous copy.
+        """
+        for name in self._dirty:
+            self._saved[name] = copy.deepcopy(self.by_player[name].to_dict())
+        self._dirty.clear()
+        return {
+            'version': self.SNAPSHOT_VERSION,
+            'projection': sorted(self.projection.stats),
+            'hands_seen': self.hands_seen,
+            'players': dict(self._saved),
+        }
+
+    def _write(self, path: str, data: Dict[str, Any]):
+        if self.projection != FULL:
+            # profiles the popup has built are kept current; the rest are rebuilt on demand
+            with self._full_lock:
+                for name in list(self.full_by_player):
+                    self._catch_up(name)
+                data['full'] = {name: copy.deepcopy(calc.to_dict()) for name, calc in self.full_by_player.items()}
+        with self._file_lock:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            tmp = f"{path}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp, path)
+
+    def save_snapshot(self, path: str):
+        """Write every calculator's counters to `path` (atomically)."""
+        self._write(path, self._collect())
+
+    def save_snapshot_async(self, path: str):
+        """
+        Like `save_snapshot`, but only the copy happens on the calling thread;
+        the file is written by a writer thread. A request the writer has not
+        started on yet is replaced by the newer one.
+        """
+        data = self._collect()
+        with self._write_cv:
+            self._write_req = (path, data)
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run_writer, daemon=True, name='stats-snapshot')
+                self._writer.start()
+            self._write_cv.notify()
+
+    def _run_writer(self):
+        while True:
+            with self._write_cv:
+                while self._write_req is None and not self._closed:
+                    self._write_cv.wait()
+                if self._write_req is None:
+                    return
+                path, data = self._write_req
+                self._write_req = None
+            try:
+                self._write(path, data)
+            except Exception as e:
+                logger.exception(f"Failed to write stats snapshot: {e}")
+
+    def close(self):
+        """Finish any pending snapshot write and stop the writer thread."""
+        with self._write_cv:
+            self._closed = True
+            self._write_cv.notify()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+
+    @classmethod
+    def load_snapshot(cls, path: str, projection: Projection = FULL) -> 'StatsManager':
+        """
+        Rebuild a manager from a snapshot written by `save_snapshot`.
+
+        The snapshot only holds the counters its projection tallies, so it is
+        refused if it was written under a different projection.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != cls.SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {data.get('version')}")
+        if data.get('projection') != sorted(projection.stats):
+            raise ValueError(f"Snapshot was written for stats {data.get('projection')}, "
+                             f"not {sorted(projection.stats)}")
+        mgr = cls(projection)
+        mgr.hands_seen = data.get('hands_seen', 0)
+        for name, state in data['players'].items():
+            mgr.by_player[name] = StatsCalculator.from_dict(name, state, projection)
+            mgr._saved[name] = copy.deepcopy(mgr.by_player[name].to_dict())
+        if projection != FULL:
+            for name, state in data.get('full', {}).items():
+                mgr.full_by_player[name] = StatsCalculator.from_dict(name, state, FULL)
+        return mgr
 
     def compute_all(self) -> Dict[str, Any]:
         return {
@@ -0,0 +1,322 @@
+import threading
+from functools import lru_cache
+from itertools import combinations_with_replacement
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ingest.parser import Hand
+
+RANKS = '23456789TJQKA'
+SUITS = 'cdhs'
+STREETS = ('FLOP', 'TURN', 'RIVER')
+BATCH = 1 << 17  # runouts evaluated per numpy batch
+PREFLOP_SAMPLES = 20000  # random runouts per preflop all-in
+
+# hand categories, packed into the top bits of a raw score
+HIGH, PAIR, TWO_PAIR, TRIPS, STRAIGHT, FLUSH, FULL_HOUSE, QUADS, STRAIGHT_FLUSH = range(9)
+
+# per-rank keys whose sums are unique over every 7-card rank multiset,
+# so a 7-card hand's ranks index straight into a table
+_RANK_KEY = np.array([0, 1, 5, 22, 98, 453, 2031, 8698, 22854, 83661, 262349, 636345, 1479181], dtype=np.int32)
+# suit counts packed one per nibble
+_SUIT_KEY = (1 << (4 * np.arange(4))).astype(np.int32)
+_BIT = (1 << np.arange(13)).astype(np.int32)
+
+
+def _mask_tables():
+    """Tables indexed by a 13-bit rank mask (bit i set = rank i present)."""
+    size = 1 << 13
+    popcnt = np.zeros(size, dtype=np.int32)
+    top = {k: np.zeros(size, dtype=np.int32) for k in (1, 2, 3, 5)}
+    straight = np.zeros(size, dtype=np.int32)  # top rank + 1, 0 = no straight
+    runs = [(0x1F << lo, lo + 5) for lo in range(9)][::-1] + [(0x100F, 4)]  # wheel last
+    for m in range(size):
+        bits = [r for r in range(12, -1, -1) if m >> r & 1]
+        popcnt[m] = len(bits)
+        for k in top:
+            top[k][m] = sum(1 << r for r in bits[:k])
+        for run, hi in runs:
+            if m & run == run:
+                straight[m] = hi
+                break
+    return popcnt, top, straight
+
+
+def _raw_scores(counts: np.ndarray, popcnt, top, straight) -> np.ndarray:
+    """Raw score of each non-flush rank multiset in `counts` (M, 13)."""
+    any_m = (counts > 0) @ _BIT
+    pair_m = (counts >= 2) @ _BIT
+    trip_m = (counts >= 3) @ _BIT
+    quad_m = (counts == 4) @ _BIT
+
+    top1, top2, top3, top5 = top[1], top[2], top[3], top[5]
+    st = straight[any_m]
+    q1 = top1[quad_m]
+    t1 = top1[trip_m]
+    fh_pair = top1[pair_m & ~t1]
+    p2 = top2[pair_m]
+    p1 = top1[pair_m]
+
+    conds = [
+        quad_m > 0,
+        (trip_m > 0) & (fh_pair > 0),
+        st > 0,
+        trip_m > 0,
+        popcnt[pair_m] >= 2,
+        pair_m > 0,
+    ]
+    cats = [QUADS, FULL_HOUSE, STRAIGHT, TRIPS, TWO_PAIR, PAIR]
+    primary = [q1, t1, st, t1, p2, p1]
+    kicker = [top1[any_m & ~q1], fh_pair, 0, top2[any_m & ~t1], top1[any_m & ~p2], top3[any_m & ~p1]]
+
+    cat = np.select(conds, cats, HIGH).astype(np.int64)
+    hi = np.select(conds, primary, top5[any_m]).astype(np.int64)
+    lo = np.select(conds, kicker, 0).astype(np.int64)
+    return (cat << 26) | (hi << 13) | lo
+
+
+@lru_cache(maxsize=1)
+def _tables() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build the evaluator lookup tables on first use.
+
+    :returns: (rank table indexed by summed _RANK_KEY, flush table indexed by
+              the flush suit's rank mask, flush suit indexed by summed _SUIT_KEY).
+              Hand values are dense class numbers, higher = better.
+    """
+    popcnt, top, straight = _mask_tables()
+
+    multisets = [ms for ms in combinations_with_replacement(range(13), 7) if max(ms.count(r) for r in set(ms)) <= 4]
+    counts = np.zeros((len(multisets), 13), dtype=np.int8)
+    for i, ms in enumerate(multisets):
+        for r in ms:
+            counts[i, r] += 1
+    rank_raw = _raw_scores(counts, popcnt, top, straight)
+
+    masks = np.nonzero(popcnt >= 5)[0]
+    sf = straight[masks]
+    flush_raw = np.where(sf > 0, (STRAIGHT_FLUSH << 26) | (sf.astype(np.int64) << 13),
+                         (FLUSH << 26) | (top[5][masks].astype(np.int64) << 13))
+
+    classes = np.unique(np.concatenate([rank_raw, flush_raw]))
+    rank_table = np.zeros(int(_RANK_KEY.max()) * 4 + int(_RANK_KEY[-2]) * 3 + 1, dtype=np.int16)
+    rank_table[counts @ _RANK_KEY] = np.searchsorted(classes, rank_raw)
+    flush_table = np.zeros(1 << 13, dtype=np.int16)
+    flush_table[masks] = np.searchsorted(classes, flush_raw)
+
+    sums = np.arange(1 << 15)
+    flush_suit = np.full(len(sums), -1, dtype=np.int8)
+    for s in range(4):
+        flush_suit[(sums >> (4 * s) & 0xF) >= 5] = s
+    return rank_table, flush_table, flush_suit
+
+
+def card_index(card: str) -> int:
+    """'Ah' -> 0..51 (rank * 4 + suit)."""
+    rank, suit = card[:-1].upper(), card[-1].lower()
+    if rank == '10':
+        rank = 'T'
+    return RANKS.index(rank) * 4 + SUITS.index(suit)
+
+
+def _lookup(rank_key: np.ndarray, suit_key: np.ndarray, cards: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+    """
+    Hand values from summed rank/suit keys.
+
+    `cards(rows)` returns the 7 cards of the given rows; it is only called for
+    the few rows that hold a flush.
+    """
+    rank_table, flush_table, flush_suit = _tables()
+    values = rank_table[rank_key]
+    fsuit = flush_suit[suit_key]
+    rows = np.nonzero(fsuit >= 0)[0]
+    if rows.size:
+        sub = cards(rows)
+        mask = np.bitwise_or.reduce(np.where((sub & 3) == fsuit[rows, None], _BIT[sub >> 2], 0), axis=1)
+        # a 7-card flush can never also be quads or a full house
+        values[rows] = flush_table[mask]
+    return values
+
+
+def evaluate(cards: np.ndarray) -> np.ndarray:
+    """
+    Value a batch of 7-card hands; higher value = better hand.
+
+    :param cards: int array of shape (N, 7) with card indices 0..51.
+    :returns: int16 array of shape (N,).
+    """
+    cards = np.asarray(cards)
+    return _lookup(_RANK_KEY[cards >> 2].sum(axis=1), _SUIT_KEY[cards & 3].sum(axis=1), lambda rows: cards[rows])
+
+
+@lru_cache(maxsize=None)
+def _combos(n: int, k: int) -> np.ndarray:
+    """Every k-subset of range(n) in lexicographic order, as an (C(n, k), k) array."""
+    if k == 0:
+        return np.zeros((1, 0), dtype=np.int8)
+    parts = []
+    for first in range(n - k + 1):
+        rest = _combos(n - first - 1, k - 1) + (first + 1)
+        parts.append(np.hstack([np.full((len(rest), 1), first, dtype=np.int8), rest]))
+    return np.vstack(parts)
+
+
+def _shares(holes: List[np.ndarray], known: np.ndarray, runouts: np.ndarray) -> np.ndarray:
+    """Summed pot shares of each hand over `runouts` (the cards still to come)."""
+    runs = np.hstack([np.broadcast_to(known, (len(runouts), len(known))), runouts])
+    # the board is shared: sum its keys once, then add each player's two cards
+    rank_key = _RANK_KEY[runs >> 2].sum(axis=1)
+    suit_key = _SUIT_KEY[runs & 3].sum(axis=1)
+    values = np.stack([
+        _lookup(rank_key + _RANK_KEY[h >> 2].sum(), suit_key + _SUIT_KEY[h & 3].sum(),
+                lambda rows, h=h: np.hstack([runs[rows], np.broadcast_to(h, (len(rows), 2))]))
+        for h in holes
+    ], axis=1)
+    best = values == values.max(axis=1, keepdims=True)
+    return (best / best.sum(axis=1, keepdims=True)).sum(axis=0)
+
+
+def _enumerate(hands: Tuple[Tuple[int, ...], ...], board: Tuple[int, ...]) -> Tuple[float, ...]:
+    """Exact equity over every remaining runout."""
+    dead = {c for h in hands for c in h} | set(board)
+    live = np.array([c for c in range(52) if c not in dead], dtype=np.int32)
+    idx = _combos(len(live), 5 - len(board))
+    known = np.array(board, dtype=np.int32)
+    holes = [np.array(h, dtype=np.int32) for h in hands]
+    shares = np.zeros(len(hands))
+    for i in range(0, len(idx), BATCH):
+        shares += _shares(holes, known, live[idx[i:i + BATCH]])
+    return tuple(float(x) for x in shares / len(idx))
+
+
+def _sample(hands: Tuple[Tuple[int, ...], ...], board: Tuple[int, ...], n: int) -> Tuple[float, ...]:
+    """Equity over `n` random runouts, seeded from the spot so results are repeatable."""
+    dead = {c for h in hands for c in h} | set(board)
+    live = np.array([c for c in range(52) if c not in dead], dtype=np.int32)
+    k = 5 - len(board)
+    rng = np.random.default_rng(abs(hash((hands, board))))
+    # a random k-subset per row: the k smallest of len(live) uniform keys
+    idx = np.argpartition(rng.random((n, len(live))), k, axis=1)[:, :k]
+    holes = [np.array(h, dtype=np.int32) for h in hands]
+    shares = _shares(holes, np.array(board, dtype=np.int32), live[idx])
+    return tuple(float(x) for x in shares / n)
+
+
+@lru_cache(maxsize=16384)
+def _equity(hands: Tuple[Tuple[int, ...], ...], board: Tuple[int, ...]) -> Tuple[float, ...]:
+    if len(board) >= 3:
+        return _enumerate(hands, board)
+    # 1.7M preflop runouts heads-up is too slow to run inline; sample instead
+    return _sample(hands, board, PREFLOP_SAMPLES)
+
+
+def _canonical(hands: List[Tuple[int, ...]], board: Sequence[int]) -> Tuple[List[int], Tuple[Tuple[int, ...], ...], Tuple[int, ...]]:
+    """
+    Relabel suits in order of first appearance so suit-isomorphic spots
+    (AhAs vs KdKc, AcAd vs KhKs) share a cache key.
+
+    :returns: (order of the hands in the key, canonical hands, canonical board).
+    """
+    # order hands by rank shape so the relabelling does not depend on player names
+    order = sorted(range(len(hands)), key=lambda i: sorted((c >> 2 for c in hands[i]), reverse=True))
+    suits: Dict[int, int] = {}
+
+    def relabel(cards) -> Tuple[int, ...]:
+        return tuple(sorted(c & ~3 | suits.setdefault(c & 3, len(suits)) for c in sorted(cards, reverse=True)))
+
+    key_board = relabel(board)
+    key_hands = tuple(relabel(hands[i]) for i in order)
+    return order, key_hands, key_board
+
+
+def equity(hands: Dict[str, List[str]], board: Sequence[str] = ()) -> Dict[str, float]:
+    """
+    All-in equity over the remaining runouts.
+
+    Flop and turn spots are enumerated exactly; preflop spots use
+    PREFLOP_SAMPLES random runouts (about +/-0.3%). Ties split the pot
+    evenly. Results are cached per suit-normalised (hands, board).
+
+    :param hands: player name -> two hole cards, e.g. {"p1": ["Ah", "Kd"]}.
+    :param board: the 0, 3 or 4 community cards already dealt.
+    :returns: player name -> share of the pot in [0, 1].
+    """
+    names = list(hands)
+    order, key_hands, key_board = _canonical([tuple(card_index(c) for c in hands[n]) for n in names],
+                                             [card_index(c) for c in board])
+    shares = _equity(key_hands, key_board)
+    return {names[i]: share for i, share in zip(order, shares)}
+
+
+def prewarm():
+    """Build the lookup tables on a background thread, off the ingest path."""
+    threading.Thread(target=_tables, daemon=True, name='equity-prewarm').start()
+
+
+def side_pots(put: Dict[str, float], live: Sequence[str]) -> List[Tuple[float, List[str]]]:
+    """
+    Split the pot into the main pot and side pots by contribution.
+
+    Each pot takes what every player put in up to the next all-in level among
+    the `live` players, and only live players who put in at least that much
+    are eligible for it. Money beyond the largest live contribution (folded
+    players' dead money) goes to the last pot.
+
+    :param put: player name -> total put into the pot, folded players included.
+    :param live: players still in the hand.
+    :returns: (amount, eligible players) pairs, main pot first.
+    """
+    pots: List[Tuple[float, List[str]]] = []
+    prev = 0.0
+    for level in sorted({put[p] for p in live}):
+        amount = sum(min(v, level) - min(v, prev) for v in put.values())
+        pots.append((amount, [p for p in live if put[p] >= level]))
+        prev = level
+    extra = sum(v - prev for v in put.values() if v > prev)
+    if pots and extra:
+        pots[-1] = (pots[-1][0] + extra, pots[-1][1])
+    return pots
+
+
+def allin_equity(hand: Hand, invested: Dict[str, float]) -> Optional[Dict[str, float]]:
+    """
+    Showdown equity at the moment the money went in.
+
+    A hand counts as all-in when it reached showdown with community cards
+    dealt after the last betting action. The pot is split into main and side
+    pots by `invested`, and each pot is shared by equity among the shown hands
+    eligible for it; a hand that was not shown is not eligible for any.
+
+    :param invested: player name -> money put into the pot, for every player.
+    :returns: player name -> expected share of the whole pot, or None if the
+        hand was not an all-in.
+    """
+    hands = {}
+    for name in hand.showdown:
+        cards = hand.showdown[name] or hand.hole_cards.get(name)
+        if cards and len(cards) == 2:
+            hands[name] = cards
+    if len(hands) < 2:
+        return None
+
+    last = 'PREFLOP'
+    for a in hand.actions:
+        if a.street in STREETS:
+            last = a.street
+    known = STREETS[:STREETS.index(last) + 1] if last in STREETS else ()
+    if not any(hand.board[st] for st in STREETS if st not in known):
+        return None
+
+    board = [c for st in known for c in hand.board[st]]
+    total = sum(invested.values())
+    if not total:
+        return None
+    share = {name: 0.0 for name in hands}
+    for amount, eligible in side_pots(invested, list(hands)):
+        if len(eligible) == 1:
+            share[eligible[0]] += amount
+            continue
+        for name, eq in equity({n: hands[n] for n in eligible}, board).items():
+            share[name] += eq * amount
+    return {name: v / total for name, v in share.items()}
@@ -0,0 +1,143 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Tuple
+
+# Per-hand rule groups StatsCalculator.update_with_hand can run:
+#   results           bb won (raw)
+#   ev                bb won at all-in equity (runs the equity engine)
+#   preflop           vpip, pfr, flop seen, called pfr, unopened pfr (+ by position)
+#   raises            3bet/4bet ladder, fold to 3bet/4bet, squeeze (+ 3bet by position)
+#   steal             blind steal / resteal
+#   postflop_actions  bets, raises, calls per street
+#   postflop_pos      bets, raises, calls in / out of position
+#   postflop_lines    check-raise, cbet, donk and the responses to them
+#   showdown          went to / won at / won without showdown
+FEATURES = ('results', 'ev', 'preflop', 'raises', 'steal',
+            'postflop_actions', 'postflop_pos', 'postflop_lines', 'showdown')
+
+# StatsCalculator counter attributes a stat can read; a projection persists only its own
+COUNTERS = ('hands_played', 'total_bb_won', 'total_ev_bb_won', 'preflop', 'by_pos',
+            'steal', 'steal_by_pos', 'postflop_street', 'postflop_pos')
+
+STREETS = ('FLOP', 'TURN', 'RIVER')
+PO_POS = ('IP', 'OOP')
+
+
+@dataclass(frozen=True)
+class Stat:
+    name: str
+    path: Tuple[str, ...]       # where the value lands in compute_stats() output
+    counters: FrozenSet[str]    # COUNTERS read by `compute`
+    features: FrozenSet[str]    # update rules that fill those counters
+    compute: Callable[[Any], Any]
+
+
+STATS: Dict[str, Stat] = {}
+
+
+def register(name: str, path: Tuple[str, ...], counters: Iterable[str], features: Iterable[str], compute: Callable[[Any], Any]):
+    counters, features = frozenset(counters), frozenset(features)
+    if not counters <= set(COUNTERS) or not features <= set(FEATURES):
+        raise ValueError(f"Stat {name!r} declares unknown counters/features: "
+                         f"{sorted(counters - set(COUNTERS)) + sorted(features - set(FEATURES))}")
+    STATS[name] = Stat(name, path, counters, features, compute)
+
+
+@dataclass(frozen=True)
+class Projection:
+    """The subset of registered stats a calculator tallies and reports."""
+    stats: FrozenSet[str]
+
+    def __post_init__(self):
+        unknown = self.stats - STATS.keys()
+        if unknown:
+            raise ValueError(f"Unknown stats: {sorted(unknown)}")
+
+    @classmethod
+    def of(cls, *names: str) -> 'Projection':
+        return cls(frozenset(names))
+
+    @property
+    def features(self) -> FrozenSet[str]:
+        return frozenset().union(*(STATS[n].features for n in self.stats))
+
+    @property
+    def counters(self) -> FrozenSet[str]:
+        return frozenset().union(*(STATS[n].counters for n in self.stats))
+
+
+# ─── Stat definitions ──────────────────────────────────────────
+
+def _hp(c) -> int:
+    return max(c.hands_played, 1)
+
+
+def _pct(group: str, key: str) -> Callable[[Any], float]:
+    return lambda c: getattr(c, group)[key]/_hp(c)*100
+
+
+def _street_sum(c, key: str) -> int:
+    return sum(c.postflop_street[s][key] for s in STREETS)
+
+
+register('hands',    ('Summary', 'Hands'),    ['hands_played'],    [], lambda c: c.hands_played)
+register('bb100',    ('Summary', 'bb/100'),   ['total_bb_won'],    ['results'], lambda c: c.total_bb_won/_hp(c)*100)
+register('evbb100',  ('Summary', 'EVbb/100'), ['total_ev_bb_won'], ['ev'],      lambda c: c.total_ev_bb_won/_hp(c)*100)
+
+for _name, _key, _feat in (('vpip', 'VPIP%', 'preflop'), ('pfr', 'PFR%', 'preflop'), ('fs', 'FS%', 'preflop'),
+                           ('cpfr', 'CPFR%', 'preflop'), ('uopfr', 'UOPR%', 'preflop'),
+                           ('3bet', '3B%', 'raises'), ('4bet', '4B%', 'raises')):
+    register(_name, ('Preflop', 'overall', _key), ['preflop'], [_feat], _pct('preflop', _name))
+
+register('preflop_by_pos', ('Preflop', 'by_pos'), ['by_pos'], ['preflop', 'raises'], lambda c: {
+    pos: {
+        'Seen': c.by_pos[pos]['seen'],
+        'VPIP%': c.by_pos[pos]['vpip']/max(c.by_pos[pos]['seen'],1)*100,
+        'PFR%':  c.by_pos[pos]['pfr']/max(c.by_pos[pos]['seen'],1)*100,
+        '3B%':   c.by_pos[pos]['3bet']/max(c.by_pos[pos]['seen'],1)*100,
+    }
+    for pos in sorted(c.by_pos)
+})
+
+for _name in ('bsa', 'fb', 'cs', 'rs', 'fr'):
+    register(_name, ('Steal', 'overall', f'{_name.upper()}%'), ['steal'], ['steal'], _pct('steal', _name))
+
+register('steal_by_pos', ('Steal', 'by_pos'), ['steal_by_pos'], ['steal'], lambda c: {
+    pos: {f'{k.upper()}%': c.steal_by_pos[pos].get(k,0)/_hp(c)*100 for k in ('bsa', 'fb', 'cs', 'rs', 'fr')}
+    for pos in sorted(c.steal_by_pos)
+})
+
+
+def _aggression(c):
+    tot_br = _street_sum(c, 'bets') + _street_sum(c, 'raises')
+    tot_c = _street_sum(c, 'calls')
+    return tot_br, tot_c
+
+
+register('agg', ('Postflop', 'overall', 'Agg%'), ['postflop_street'], ['postflop_actions'],
+         lambda c: (lambda br, ca: br/ca*100 if ca else 0)(*_aggression(c)))
+register('af',  ('Postflop', 'overall', 'AF'),   ['postflop_street'], ['postflop_actions'],
+         lambda c: (lambda br, ca: br/ca if ca else 0)(*_aggression(c)))
+
+for _name in ('wts', 'was', 'wws'):
+    register(_name, ('Postflop', 'overall', f'{_name.upper()}%'), ['postflop_street'], ['showdown'],
+             lambda c, k=_name: _street_sum(c, k)/_hp(c)*100)
+
+_LINES = (('Bet%', 'bets'), ('Raise%', 'raises'), ('Call%', 'calls'), ('CR%', 'cr'), ('FCR%', 'fcr'),
+          ('CBet%', 'cbet'), ('FCB%', 'fcb'), ('RCB%', 'rcb'), ('FRCB%', 'frcb'), ('CBet3%', 'cbet3'),
+          ('FCB3%', 'fcb3'), ('DB%', 'donk'), ('FDB%', 'fdb'), ('CDB%', 'cdb'))
+
+register('by_street', ('Postflop', 'by_street'), ['postflop_street'], ['postflop_actions', 'postflop_lines'], lambda c: {
+    st: {label: c.postflop_street[st][k]/_hp(c)*100 for label, k in _LINES}
+    for st in STREETS
+})
+
+register('by_ip_oop', ('Postflop', 'by_ip_oop'), ['postflop_pos'], ['postflop_pos'], lambda c: {
+    po: {label: c.postflop_pos[po][k]/_hp(c)*100 for label, k in _LINES[:3]}
+    for po in PO_POS
+})
+
+
+# ─── Profiles ──────────────────────────────────────────────────
+
+HUD = Projection.of('hands', 'vpip', 'pfr', '3bet', 'af')
+FULL = Projection(frozenset(STATS))
@@ -0,0 +1,38 @@
+from ingest.parser import parse_hand
+from stats.calculator import StatsCalculator, _invested
+
+ANTE_HAND = """\
+PokerStars Hand #1: Tournament #9, $1+$0.10 USD Hold'em No Limit - Level V (25/50) - 2024/01/01 10:00:00 ET
+Table '9 1' 9-max Seat #1 is the button
+Seat 1: A (1500 in chips)
+Seat 2: B (1500 in chips)
+Seat 3: C (1500 in chips)
+A: posts the ante 5
+B: posts the ante 5
+C: posts the ante 5
+B: posts small blind 25
+C: posts big blind 50
+*** HOLE CARDS ***
+A: folds
+B: calls 25
+C: raises 10 to 60
+B: folds
+Uncalled bet (10) returned to C
+C collected 115 from pot
+*** SUMMARY ***
+"""
+
+
+def test_invested_counts_antes_on_top_of_raises():
+    hand = parse_hand(ANTE_HAND)
+    # ante + raise to 60, less the uncalled 10
+    assert _invested(hand, 'C') == 55
+    assert _invested(hand, 'B') == 55
+    assert _invested(hand, 'A') == 5
+
+
+def test_bb_won_is_net_of_antes():
+    hand = parse_hand(ANTE_HAND)
+    calc = StatsCalculator('C')
+    calc.update_with_hand(hand)
+    assert calc.total_bb_won == (115 - 55) / 50
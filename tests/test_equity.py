@@ -0,0 +1,102 @@
+import random
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from ingest.parser import Action, Hand
+from stats.equity import _enumerate, allin_equity, card_index, equity, evaluate, side_pots
+
+
+def _rank5(cards):
+    """Brute-force rank of a 5-card hand as a comparable tuple."""
+    ranks = sorted((c >> 2 for c in cards), reverse=True)
+    flush = len({c & 3 for c in cards}) == 1
+    uniq = sorted(set(ranks), reverse=True)
+    straight = None
+    if len(uniq) == 5 and uniq[0] - uniq[4] == 4:
+        straight = uniq[0]
+    elif uniq == [12, 3, 2, 1, 0]:
+        straight = 3
+    groups = sorted(Counter(ranks).items(), key=lambda g: (g[1], g[0]), reverse=True)
+    shape = [n for _, n in groups]
+    by_group = [r for r, _ in groups]
+    if straight is not None and flush:
+        return (8, straight)
+    if shape[0] == 4:
+        return (7, *by_group)
+    if shape[:2] == [3, 2]:
+        return (6, *by_group)
+    if flush:
+        return (5, *ranks)
+    if straight is not None:
+        return (4, straight)
+    if shape[0] == 3:
+        return (3, *by_group)
+    if shape[:2] == [2, 2]:
+        return (2, *by_group)
+    if shape[0] == 2:
+        return (1, *by_group)
+    return (0, *ranks)
+
+
+def _rank7(cards):
+    return max(_rank5(c) for c in combinations(cards, 5))
+
+
+def _cmp(a, b):
+    return (a > b) - (a < b)
+
+
+def test_evaluate_matches_brute_force():
+    rng = random.Random(7)
+    hands = [rng.sample(range(52), 7) for _ in range(3000)]
+    values = [int(v) for v in evaluate(np.array(hands))]
+    ref = [_rank7(h) for h in hands]
+    for _ in range(20000):
+        i, j = rng.randrange(len(hands)), rng.randrange(len(hands))
+        assert _cmp(values[i], values[j]) == _cmp(ref[i], ref[j]), (hands[i], hands[j])
+
+
+def test_aces_vs_kings_exact():
+    aces = tuple(sorted(card_index(c) for c in ('Ah', 'As')))
+    kings = tuple(sorted(card_index(c) for c in ('Kd', 'Kc')))
+    shares = _enumerate((aces, kings), ())
+    # 1,712,304 runouts; known result 81.26% / 18.74% with ties split
+    assert shares[0] == pytest.approx(0.81255, abs=1e-4)
+    assert sum(shares) == pytest.approx(1.0)
+
+
+def test_preflop_sampling_close_to_exact():
+    shares = equity({'a': ['Ah', 'As'], 'b': ['Kd', 'Kc']})
+    assert shares['a'] == pytest.approx(0.81255, abs=0.01)
+
+
+def test_suit_isomorphic_spots_agree():
+    a = equity({'a': ['Ah', 'As'], 'b': ['Kd', 'Kc']}, ['2h', '7c', '9d'])
+    b = equity({'x': ['Kh', 'Ks'], 'y': ['Ac', 'Ad']}, ['2c', '7h', '9s'])
+    assert a['a'] == pytest.approx(b['y'])
+    assert a['b'] == pytest.approx(b['x'])
+
+
+def test_side_pots_split_by_contribution():
+    # short all-in for 10, two callers for 100, one player folded after putting in 5
+    pots = side_pots({'short': 10, 'b': 100, 'c': 100, 'f': 5}, ['short', 'b', 'c'])
+    assert pots == [(35, ['short', 'b', 'c']), (180, ['b', 'c'])]
+
+
+def test_allin_equity_short_stack_only_shares_the_main_pot():
+    hand = Hand(hand_id='1', date='', table='t', button_seat=1, stakes='$0.05/$0.10')
+    hand.actions = [Action('PREFLOP', 'short', 'raises', 10), Action('PREFLOP', 'b', 'calls', 100),
+                    Action('PREFLOP', 'c', 'calls', 100)]
+    hand.board = {'FLOP': ['2c', '7d', '9h'], 'TURN': ['Js'], 'RIVER': ['3d']}
+    hand.showdown = {'short': ['Ah', 'As'], 'b': ['Kd', 'Kc'], 'c': ['Qh', 'Qs']}
+    invested = {'short': 10, 'b': 100, 'c': 100}
+
+    shares = allin_equity(hand, invested)
+    three = equity(hand.showdown)
+    two = equity({n: hand.showdown[n] for n in ('b', 'c')})
+    assert shares['short'] == pytest.approx(three['short'] * 30 / 210)
+    assert shares['b'] == pytest.approx((three['b'] * 30 + two['b'] * 180) / 210)
+    assert sum(shares.values()) == pytest.approx(1.0)
@@ -0,0 +1,74 @@
+from ingest.parser import parse_hand
+
+CASH_HAND = """\
+PokerStars Hand #254371223091:  Hold'em No Limit ($0.05/$0.10 USD) - 2024/11/02 21:14:09 ET
+Table 'Aludra IV' 6-max Seat #4 is the button
+Seat 1: alice ($10.45 in chips)
+Seat 2: bob ($9.80 in chips)
+Seat 3: carol ($12.10 in chips)
+Seat 4: dave ($10 in chips)
+alice: posts small blind $0.05
+bob: posts big blind $0.10
+*** HOLE CARDS ***
+Dealt to alice [Ah Kd]
+carol: raises $0.20 to $0.30
+dave: folds
+alice: raises $0.80 to $1.10
+bob: folds
+carol: calls $0.80
+*** FLOP *** [2c 7d 9h]
+alice: bets $1.20
+carol: calls $1.20
+*** TURN *** [2c 7d 9h] [Js]
+alice: checks
+carol: bets $2.50
+alice: calls $2.50
+*** RIVER *** [2c 7d 9h Js] [Kh]
+alice: bets $5.65 and is all-in
+carol: folds
+Uncalled bet ($5.65) returned to alice
+alice collected $9.70 from pot
+*** SUMMARY ***
+Total pot $9.70 | Rake $0
+Board [2c 7d 9h Js Kh]
+"""
+
+
+def test_parse_cash_hand():
+    hand = parse_hand(CASH_HAND)
+    assert hand.hand_id == '254371223091'
+    assert hand.table == 'Aludra IV'
+    assert hand.button_seat == 4
+    assert [(p.name, p.stack, p.pos_id) for p in hand.players] == [
+        ('alice', 10.45, 2), ('bob', 9.80, 3), ('carol', 12.10, 4), ('dave', 10.0, 1)]
+    assert [(a.player, a.amount) for a in hand.posts] == [('alice', 0.05), ('bob', 0.10)]
+    assert hand.hole_cards == {'alice': ['Ah', 'Kd']}
+
+
+def test_parse_board_takes_the_new_card_on_later_streets():
+    hand = parse_hand(CASH_HAND)
+    assert hand.board == {'FLOP': ['2c', '7d', '9h'], 'TURN': ['Js'], 'RIVER': ['Kh']}
+
+
+def test_parse_dollar_amounts_and_raise_to():
+    hand = parse_hand(CASH_HAND)
+    acts = [(a.street, a.player, a.action, a.amount) for a in hand.actions]
+    assert acts[:5] == [
+        ('PREFLOP', 'carol', 'raises', 0.30),
+        ('PREFLOP', 'dave', 'folds', None),
+        ('PREFLOP', 'alice', 'raises', 1.10),
+        ('PREFLOP', 'bob', 'folds', None),
+        ('PREFLOP', 'carol', 'calls', 0.80),
+    ]
+    assert ('RIVER', 'alice', 'bets', 5.65) in acts
+    assert hand.uncalled == {'alice': 5.65}
+    assert hand.winners == ['alice']
+    assert hand.win_amounts == {'alice': 9.70}
+
+
+def test_parse_side_pots_add_up():
+    text = CASH_HAND.replace("alice collected $9.70 from pot",
+                             "alice collected $6.00 from side pot\nalice collected $3.70 from main pot")
+    hand = parse_hand(text)
+    assert hand.winners == ['alice']
+    assert hand.win_amounts['alice'] == 9.70
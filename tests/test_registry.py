@@ -0,0 +1,52 @@
+import pytest
+
+from ingest.parser import parse_hand
+from soak.simulator import TableSimulator
+from stats.calculator import StatsManager
+from stats.registry import FULL, HUD, STATS, Projection, register
+
+
+@pytest.fixture(scope='module')
+def hands():
+    sim = TableSimulator('Registry', seed=11, allin_rate=0.1)
+    return [parse_hand(sim.next_hand()[1]) for _ in range(300)]
+
+
+@pytest.fixture(scope='module')
+def full(hands):
+    mgr = StatsManager(FULL)
+    for hand in hands:
+        mgr.update_with_hand(hand)
+    return mgr
+
+
+def test_hud_stats_match_full(hands, full):
+    mgr = StatsManager(HUD)
+    for hand in hands:
+        mgr.update_with_hand(hand)
+    assert mgr.by_player.keys() == full.by_player.keys()
+    for name, calc in mgr.by_player.items():
+        assert calc.compute_stats() == full.by_player[name].compute_stats(HUD)
+
+
+@pytest.mark.parametrize('stat', sorted(STATS))
+def test_single_stat_projection_matches_full(hands, full, stat):
+    proj = Projection.of(stat)
+    mgr = StatsManager(proj)
+    for hand in hands:
+        mgr.update_with_hand(hand)
+    for name, calc in mgr.by_player.items():
+        assert calc.compute_stats() == full.by_player[name].compute_stats(proj)
+
+
+def test_projection_rejects_unknown_stats():
+    with pytest.raises(ValueError, match='nope'):
+        Projection.of('vpip', 'nope')
+
+
+def test_register_rejects_unknown_counters_and_features():
+    with pytest.raises(ValueError, match='no_such_counter'):
+        register('bad', ('X', 'bad'), ['no_such_counter'], [], lambda c: 0)
+    with pytest.raises(ValueError, match='no_such_feature'):
+        register('bad', ('X', 'bad'), ['hands_played'], ['no_such_feature'], lambda c: 0)
+    assert 'bad' not in STATS
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from ingest.parser import parse_hand
+from soak.simulator import TableSimulator
+from stats.calculator import StatsManager
+from stats.registry import FULL, HUD
+
+
+@pytest.fixture(scope='module')
+def hands():
+    sim = TableSimulator('Snapshot', seed=21, allin_rate=0.1)
+    return [parse_hand(sim.next_hand()[1]) for _ in range(200)]
+
+
+def _fed(projection, hands):
+    mgr = StatsManager(projection)
+    for hand in hands:
+        mgr.update_with_hand(hand)
+    return mgr
+
+
+@pytest.mark.parametrize('projection', [HUD, FULL], ids=['hud', 'full'])
+def test_round_trip(tmp_path, hands, projection):
+    path = str(tmp_path / 'snap.json')
+    mgr = _fed(projection, hands)
+    mgr.save_snapshot(path)
+    restored = StatsManager.load_snapshot(path, projection)
+    assert restored.hands_seen == mgr.hands_seen
+    assert restored.compute_all() == mgr.compute_all()
+
+
+def test_round_trip_keeps_full_profiles_built_for_the_popup(tmp_path, hands):
+    path = str(tmp_path / 'snap.json')
+    mgr = _fed(HUD, hands[:100])
+    name = next(iter(mgr.by_player))
+    mgr.full_stats(name)
+    mgr.save_snapshot(path)
+
+    restored = StatsManager.load_snapshot(path, HUD)
+    full = _fed(FULL, hands)
+    for hand in hands[100:]:
+        restored.update_with_hand(hand)
+    assert restored.full_stats(name) == full.full_stats(name)
+
+
+def test_async_save_is_written_by_close(tmp_path, hands):
+    path = str(tmp_path / 'snap.json')
+    mgr = _fed(HUD, hands)
+    mgr.save_snapshot_async(path)
+    mgr.close()
+    assert StatsManager.load_snapshot(path, HUD).compute_all() == mgr.compute_all()
+
+
+def test_refuses_old_version(tmp_path, hands):
+    path = tmp_path / 'snap.json'
+    _fed(HUD, hands[:10]).save_snapshot(str(path))
+    data = json.loads(path.read_text())
+    data['version'] = StatsManager.SNAPSHOT_VERSION - 1
+    path.write_text(json.dumps(data))
+    with pytest.raises(ValueError, match='version'):
+        StatsManager.load_snapshot(str(path), HUD)
+
+
+def test_refuses_different_projection(tmp_path, hands):
+    path = str(tmp_path / 'snap.json')
+    _fed(HUD, hands[:10]).save_snapshot(path)
+    with pytest.raises(ValueError, match='written for stats'):
+        StatsManager.load_snapshot(path, FULL)
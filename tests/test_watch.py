@@ -0,0 +1,21 @@
+import time
+
+from ingest.watch import FileWatcher
+from test_parser import CASH_HAND
+
+
+def test_watcher_delivers_appended_hands(tmp_path):
+    path = tmp_path / 'HH_test.txt'
+    path.write_text('')
+    received = []
+    watcher = FileWatcher(str(path), received.append)
+    watcher.start()
+    try:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(CASH_HAND + "\n\n")
+        deadline = time.monotonic() + 5
+        while not received and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        watcher.stop()
+    assert [t.strip() for t in received] == [CASH_HAND.strip()]